@@ -2,24 +2,34 @@
 """UAVChum — Weather & Aviation Intelligence. Zero API keys."""
 
 import datetime
-import json
 import logging
 import math
 import os
+import re
 import secrets
+import sqlite3
 import threading
 import time
-from collections import deque
-from functools import lru_cache
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import cache, lru_cache
 from http.cookiejar import DefaultCookiePolicy
-from re import fullmatch
+from itertools import chain, repeat
+from typing import NamedTuple
 
-import defusedxml.ElementTree as ET  # noqa: N817
+import diskcache
+import ijson
+import numpy as np
+import orjson
 import requests
-from flask import Flask, g, jsonify, render_template, request
+import shapely
+from flask import Flask, Response, g, jsonify, render_template, request
+from flask.json.provider import JSONProvider
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from requests.adapters import HTTPAdapter
+from shapely.strtree import STRtree
 from urllib3.util.retry import Retry
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -35,7 +45,26 @@ def _is_production() -> bool:
     return os.environ.get("UAVCHUM_ENV", os.environ.get("FLASK_ENV", "")).strip().lower() == "production"
 
 
+class _OrjsonProvider(JSONProvider):
+    """Serve jsonify() and request JSON through orjson instead of stdlib json."""
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self._OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self._OPTIONS), mimetype="application/json"
+        )
+
+
 app = Flask(__name__)
+app.json = _OrjsonProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 app.secret_key = os.environ.get("SECRET_KEY", secrets.token_hex(32))
 app.config.update(
@@ -60,25 +89,103 @@ limiter = Limiter(
 
 # ── HTTP Session with connection pooling ─────────────────────────────
 _session = requests.Session()
+# Retry idempotent GETs briefly on connection failures and gateway errors only — a
+# read timeout has already spent the caller's budget, so it is never retried.  The
+# last response is still returned (not raised) so callers keep seeing the status.
+# Retry-After is ignored: a maintenance 503 asking for minutes would otherwise pin
+# request threads and _executor workers far beyond the caller's timeout.
 _retry_strategy = Retry(
-    total=0,
-    backoff_factor=0,
-    status_forcelist=[],
+    total=2,
+    connect=2,
+    read=0,
+    status=2,
+    backoff_factor=0.2,
+    status_forcelist=[502, 503, 504],
+    respect_retry_after_header=False,
+    raise_on_status=False,
 )
-_adapter = HTTPAdapter(max_retries=_retry_strategy, pool_connections=10, pool_maxsize=10)
+_adapter = HTTPAdapter(max_retries=_retry_strategy, pool_connections=32, pool_maxsize=64)
 _session.mount("http://", _adapter)
 _session.mount("https://", _adapter)
+# Dedicated keep-alive pools for the busiest upstreams so they don't compete for slots
+for _host in (
+    "https://api.open-meteo.com/",
+    "https://nominatim.openstreetmap.org/",
+    "https://storage.googleapis.com/",
+    "https://aviationweather.gov/",
+    "https://services6.arcgis.com/",
+):
+    _session.mount(
+        _host, HTTPAdapter(max_retries=_retry_strategy, pool_connections=1, pool_maxsize=64)
+    )
 _session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
 _session.max_redirects = 3
 
+# Shared pool for fanning out independent upstream calls within one request
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="upstream")
+
 # ── OpenAIP Cache ───────────────────────────────────────────────────
-_openaip_cache: dict = {}
+_openaip_cache: OrderedDict = OrderedDict()  # LRU order, oldest first
 _openaip_lock = threading.Lock()
 _OPENAIP_TTL = 3600 * 24  # 24 hours
+_OPENAIP_MAX_COUNTRIES = 16
+_OPENAIP_COOLDOWN = 300  # skip GCS for 5 min after a failed fetch
+_openaip_retry_at = 0.0
+_OPENAIP_MAX_FEATURES = 250
+
+# Lower type number = higher drone priority (Prohibited > Restricted > Danger > CTR …).
+# Flat table indexed by OpenAIP airspace type code; unknown types sort last (99).
+_OPENAIP_TYPE_PRIO = bytearray([99]) * 32
+for _type, _prio in {
+    3: 0,
+    1: 1,
+    2: 2,
+    4: 3,
+    13: 4,
+    14: 5,
+    18: 6,
+    28: 7,
+    5: 8,
+    7: 8,
+    26: 9,
+    21: 10,
+    6: 10,
+    0: 11,
+}.items():
+    _OPENAIP_TYPE_PRIO[_type] = _prio
+
+# ── Reverse-geocode cache ───────────────────────────────────────────
+_GEOCODE_CACHE_DIR = os.environ.get("GEOCODE_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+    "uavchum-geocode",
+)
+_GEOCODE_TTL = 3600 * 24 * 30  # 30 days — country borders don't move
+# A full disk or lock contention must only cost a cache miss, never the request
+_GEOCODE_CACHE_ERRORS = (sqlite3.Error, diskcache.Timeout, OSError)
+
+
+def _open_geocode_cache(path: str) -> diskcache.Cache | None:
+    """Open the on-disk geocode cache, or return None to stay in-process only.
+
+    diskcache unpickles what it reads, so a directory owned by another user is refused.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        if os.stat(path).st_uid != os.getuid():
+            logger.warning("Geocode cache %s is owned by another user; in-process only", path)
+            return None
+        return diskcache.Cache(path)
+    except _GEOCODE_CACHE_ERRORS:
+        logger.warning("Geocode cache unavailable at %s; in-process only", path)
+        return None
+
+
+_geocode_cache = _open_geocode_cache(_GEOCODE_CACHE_DIR)
 
 # ── Input validation ────────────────────────────────────────────────
-_ICAO_RE = r"[A-Z][A-Z0-9]{2,3}"
-_CC_RE = r"[A-Z]{2}"
+_ICAO_RE = re.compile(r"[A-Z][A-Z0-9]{2,3}")
+_CC_RE = re.compile(r"[A-Z]{2}")
+_CALLSIGN_RE = re.compile(r"[A-Z0-9]{3,8}")
 _SEARCH_MAX = 200
 
 
@@ -91,52 +198,58 @@ def _valid_lon(v) -> bool:
 
 
 def _valid_station(s: str) -> bool:
-    return bool(fullmatch(_ICAO_RE, s))
+    return _ICAO_RE.fullmatch(s) is not None
 
 
 def _valid_country(s: str) -> bool:
-    return bool(fullmatch(_CC_RE, s))
+    return _CC_RE.fullmatch(s) is not None
 
 
 # ── Security headers ────────────────────────────────────────────────
+_STATIC_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(self), microphone=(), camera=(), clipboard-write=(self)",
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Cross-Origin-Resource-Policy": "same-origin",
+    "Cross-Origin-Embedder-Policy": "credentialless",
+    "X-XSS-Protection": "0",
+}
+_HSTS = "max-age=31536000; includeSubDomains"
+# Built once at import; only the per-request nonce is substituted
+_CSP = (
+    "default-src 'self'; "
+    "base-uri 'none'; "
+    "object-src 'none'; "
+    "frame-ancestors 'none'; "
+    "frame-src 'none'; "
+    "form-action 'self'; "
+    "manifest-src 'self'; "
+    "worker-src 'self'; "
+    "script-src 'self' 'nonce-{nonce}'; "
+    "script-src-attr 'none'; "
+    "style-src 'self'; "
+    "style-src-attr 'unsafe-inline'; "
+    "font-src 'self' data:; "
+    "img-src 'self' data: https://*.tile.openstreetmap.org "
+    "https://*.basemaps.cartocdn.com "
+    "https://tilecache.rainviewer.com; "
+    "connect-src 'self' https://nominatim.openstreetmap.org "
+    "https://*.basemaps.cartocdn.com https://api.rainviewer.com"
+)
+_CSP_HTTPS = _CSP + "; upgrade-insecure-requests"
+
+
 @app.after_request
 def set_security_headers(response):
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = (
-        "geolocation=(self), microphone=(), camera=(), clipboard-write=(self)"
-    )
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-    response.headers["Cross-Origin-Embedder-Policy"] = "credentialless"
-    response.headers["X-XSS-Protection"] = "0"
-    if request.is_secure:
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    nonce = getattr(g, "csp_nonce", "")
-    csp = (
-        "default-src 'self'; "
-        "base-uri 'none'; "
-        "object-src 'none'; "
-        "frame-ancestors 'none'; "
-        "frame-src 'none'; "
-        "form-action 'self'; "
-        "manifest-src 'self'; "
-        "worker-src 'self'; "
-        f"script-src 'self' 'nonce-{nonce}'; "
-        "script-src-attr 'none'; "
-        "style-src 'self'; "
-        "style-src-attr 'unsafe-inline'; "
-        "font-src 'self' data:; "
-        "img-src 'self' data: https://*.tile.openstreetmap.org "
-        "https://*.basemaps.cartocdn.com "
-        "https://tilecache.rainviewer.com; "
-        "connect-src 'self' https://nominatim.openstreetmap.org "
-        "https://*.basemaps.cartocdn.com https://api.rainviewer.com"
-    )
+    response.headers.update(_STATIC_HEADERS)
     if request.is_secure:
-        csp += "; upgrade-insecure-requests"
-    response.headers["Content-Security-Policy"] = csp
+        response.headers["Strict-Transport-Security"] = _HSTS
+        csp = _CSP_HTTPS
+    else:
+        csp = _CSP
+    response.headers["Content-Security-Policy"] = csp.format(nonce=getattr(g, "csp_nonce", ""))
     if request.path.startswith("/api/"):
         response.headers["Cache-Control"] = "no-store"
     if request.path == "/":
@@ -150,63 +263,190 @@ def set_csp_nonce():
 
 
 # ── Geometry helpers ────────────────────────────────────────────────
-def _geom_bbox(geom):
-    """Return (minlon, minlat, maxlon, maxlat) for any GeoJSON geometry."""
-    gt = geom.get("type", "")
-    coords = geom.get("coordinates", [])
-    flat = []
+def _geom_rings(gt: str, coords):
+    """Yield each coordinate sequence (ring / line / point list) of a GeoJSON geometry."""
     if gt == "Point":
-        flat = [coords]
+        yield [coords]
     elif gt in ("LineString", "MultiPoint"):
-        flat = coords
-    elif gt == "Polygon":
-        flat = [c for ring in coords for c in ring]
+        yield coords
+    elif gt in ("Polygon", "MultiLineString"):
+        yield from coords
     elif gt == "MultiPolygon":
-        flat = [c for poly in coords for ring in poly for c in ring]
-    elif gt == "MultiLineString":
-        flat = [c for line in coords for c in line]
-    pts = [c for c in flat if len(c) >= 2]
-    if not pts:
+        for poly in coords:
+            yield from poly
+
+
+def _geom_bbox(geom):
+    """Return (minlon, minlat, maxlon, maxlat) for any GeoJSON geometry."""
+    arrays = []
+    for ring in _geom_rings(geom.get("type", ""), geom.get("coordinates", [])):
+        try:
+            arr = np.asarray(ring, dtype=np.float64)
+        except ValueError:
+            # Ragged ring (mixed 2D/3D positions) — trim to lon/lat first
+            arr = np.asarray([c[:2] for c in ring if len(c) >= 2], dtype=np.float64)
+        except TypeError:
+            continue
+        if arr.ndim == 2 and arr.shape[1] >= 2:
+            arrays.append(arr[:, :2])
+    if not arrays:
+        return None
+    pts = np.concatenate(arrays, axis=0)
+    lo = pts.min(axis=0)
+    hi = pts.max(axis=0)
+    return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+
+def _index_openaip(data) -> dict:
+    """Precompute per-feature bboxes and drone priorities for an OpenAIP payload.
+
+    Runs once per cache fill and packs the bboxes into an STR R-tree, so each
+    request is an O(log n + k) tree query rather than a scan of every feature.
+    Features without usable geometry, or whose floor is above FL100 (irrelevant
+    for drones), are dropped here since that test does not depend on the query.
+    Kept features are stored as zlib-compressed orjson bytes (roughly a third of
+    the raw size) and only inflated and decoded when returned.
+    """
+    features, bboxes, prios = [], [], []
+    for feat in (data or {}).get("features", []):
+        geom = feat.get("geometry")
+        if not geom:
+            continue
+        bbox = _geom_bbox(geom)
+        if not bbox:
+            continue
+        p = feat.get("properties", {})
+        t = p.get("type", 99)
+        lower = p.get("lowerLimit", {})
+        unit = lower.get("unit", 1)  # 1=ft, 6=FL
+        val = lower.get("value") or 0
+        floor_ft = val * 100 if unit == 6 else val
+        if floor_ft > 10000 and t not in (1, 2, 3):
+            continue
+        features.append(zlib.compress(orjson.dumps(feat)))
+        bboxes.append(bbox)
+        prios.append(
+            _OPENAIP_TYPE_PRIO[t] if isinstance(t, int) and 0 <= t < len(_OPENAIP_TYPE_PRIO) else 99
+        )
+    bb = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+    return {
+        "features": features,
+        "tree": STRtree(shapely.box(bb[:, 0], bb[:, 1], bb[:, 2], bb[:, 3])),
+        "prio": np.array(prios, dtype=np.int16),
+    }
+
+
+def _openaip_store(cc: str, entry: dict) -> None:
+    """Insert/refresh a cache entry as most recently used. Caller holds _openaip_lock."""
+    _openaip_cache[cc] = entry
+    _openaip_cache.move_to_end(cc)
+    while len(_openaip_cache) > _OPENAIP_MAX_COUNTRIES:
+        _openaip_cache.popitem(last=False)
+
+
+def _openaip_revalidation_headers(cached: dict | None) -> dict:
+    """Conditional-GET headers so an unchanged expired copy isn't re-downloaded."""
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def _openaip_from_response(cc: str, r, cached: dict | None) -> tuple | None:
+    """Cache a 200 (fresh index) or 304 (bump the timestamp) OpenAIP response.
+
+    Returns (index, was_cached, cache_ts), or None for any other status.
+    """
+    ts = int(time.time())
+    if r.status_code == 304 and cached:
+        entry, was_cached = {**cached, "ts": ts}, True
+    elif r.status_code == 200:
+        entry = {
+            "index": _index_openaip(orjson.loads(r.content)),
+            "ts": ts,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+        was_cached = False
+    else:
         return None
-    lons = [c[0] for c in pts]
-    lats = [c[1] for c in pts]
-    return (min(lons), min(lats), max(lons), max(lats))
+    with _openaip_lock:
+        _openaip_store(cc, entry)
+    return entry["index"], was_cached, ts
 
 
 def fetch_openaip(country_code: str) -> tuple:
-    """Fetch and cache OpenAIP airspace GeoJSON for a country (24 h TTL).
+    """Fetch and cache indexed OpenAIP airspace for a country (24 h TTL).
 
-    Returns (data, was_cached, cache_ts).
+    Returns (index, was_cached, cache_ts) where index is the _index_openaip() dict.
+    Expired entries are revalidated with ETag / Last-Modified; a 304 just
+    bumps the timestamp.  After a connection error or 5xx, GCS is skipped for
+    _OPENAIP_COOLDOWN seconds; on any failure a stale cached copy is served.
     """
+    global _openaip_retry_at
     cc = country_code.lower()
     now = time.time()
     with _openaip_lock:
         cached = _openaip_cache.get(cc)
-        if cached and now - cached["ts"] < _OPENAIP_TTL:
-            return cached["data"], True, int(cached["ts"])
+        cooling_down = now < _openaip_retry_at
+        if cached:
+            _openaip_cache.move_to_end(cc)
+        if cached and (cooling_down or now - cached["ts"] < _OPENAIP_TTL):
+            return cached["index"], True, int(cached["ts"])
+    if cooling_down:
+        return None, False, None
     try:
         url = (
             f"https://storage.googleapis.com/29f98e10-a489-4c82-ae5e-489dbcd4912f/{cc}_asp.geojson"
         )
-        r = _session.get(url, timeout=30)
-        if r.status_code == 200:
-            data = r.json()
-            ts = int(time.time())
-            with _openaip_lock:
-                _openaip_cache[cc] = {"data": data, "ts": ts}
-            return data, False, ts
+        r = _session.get(url, headers=_openaip_revalidation_headers(cached), timeout=30)
+        result = _openaip_from_response(cc, r, cached)
+        if result is not None:
+            return result
+        if r.status_code >= 500:  # 404 just means no data for this country
+            r.raise_for_status()
     except requests.RequestException:
         logger.warning("OpenAIP fetch failed for country %s", cc)
+        with _openaip_lock:
+            _openaip_retry_at = time.time() + _OPENAIP_COOLDOWN
+    except orjson.JSONDecodeError:
+        # A corrupt file is this country's problem — don't cool down the others
+        logger.warning("OpenAIP data for country %s is not valid JSON", cc)
+    if cached:
+        return cached["index"], True, int(cached["ts"])
     return None, False, None
 
 
+def _country_from_latlon(lat: float, lon: float) -> str:
+    """Reverse-geocode lat/lon to a 2-letter ISO country code on a 1° grid.
+
+    Rounding happens here rather than at call sites, so every caller shares
+    the same cache cells and nobody can hit Nominatim with raw coordinates.
+    """
+    return _country_from_cell(round(lat), round(lon))
+
+
 @lru_cache(maxsize=512)
-def _country_from_latlon(lat_r: float, lon_r: float) -> str:
-    """Reverse-geocode a coarse lat/lon (1° grid) to a 2-letter ISO country code.
+def _country_from_cell(lat_r: int, lon_r: int) -> str:
+    """Reverse-geocode a 1° grid cell to a 2-letter ISO country code.
 
-    Results are cached in-process; Nominatim is only hit once per grid cell.
-    Returns '' if lookup fails so callers can fall through gracefully.
+    Results are cached in-process and in the shared on-disk geocode cache
+    (30-day TTL), so Nominatim is only hit once per grid cell across workers
+    and restarts.  Returns '' if lookup fails so callers can fall through gracefully.
     """
+    key = f"{lat_r},{lon_r}"
+    if _geocode_cache is not None:
+        try:
+            cc = _geocode_cache.get(key)
+        except _GEOCODE_CACHE_ERRORS as exc:
+            logger.warning("Geocode cache read failed for %s: %s", key, exc)
+            cc = None
+        if cc is not None:
+            logger.debug("Geocode cache hit %s", key)
+            return cc
+    logger.debug("Geocode cache miss %s", key)
     try:
         r = _session.get(
             "https://nominatim.openstreetmap.org/reverse",
@@ -215,61 +455,28 @@ def _country_from_latlon(lat_r: float, lon_r: float) -> str:
             timeout=5,
         )
         if r.status_code == 200:
-            return r.json().get("address", {}).get("country_code", "").upper()
-    except requests.RequestException:
+            cc = orjson.loads(r.content).get("address", {}).get("country_code", "").upper()
+            if _geocode_cache is not None:
+                try:
+                    _geocode_cache.set(key, cc, expire=_GEOCODE_TTL)
+                except _GEOCODE_CACHE_ERRORS as exc:
+                    logger.warning("Geocode cache write failed for %s: %s", key, exc)
+            return cc
+    except (requests.RequestException, orjson.JSONDecodeError):
         pass
     return ""
 
 
-def filter_openaip(data, lat, lon, delta):
-    """Filter OpenAIP features to the request bbox, drone-relevant only."""
-    if not data:
+def filter_openaip(index, lat, lon, delta):
+    """Filter indexed OpenAIP features to the request bbox, highest priority first."""
+    if not index or not index["features"]:
         return []
-    q_minlon, q_maxlon = lon - delta, lon + delta
-    q_minlat, q_maxlat = lat - delta, lat + delta
-
-    # Lower type number = higher drone priority (Prohibited > Restricted > Danger > CTR …)
-    type_prio = {
-        3: 0,
-        1: 1,
-        2: 2,
-        4: 3,
-        13: 4,
-        14: 5,
-        18: 6,
-        28: 7,
-        5: 8,
-        7: 8,
-        26: 9,
-        21: 10,
-        6: 10,
-        0: 11,
-    }
-
-    results = []
-    for feat in data.get("features", []):
-        geom = feat.get("geometry")
-        if not geom:
-            continue
-        bbox = _geom_bbox(geom)
-        if not bbox:
-            continue
-        fminlon, fminlat, fmaxlon, fmaxlat = bbox
-        if fmaxlon < q_minlon or fminlon > q_maxlon or fmaxlat < q_minlat or fminlat > q_maxlat:
-            continue
-        p = feat.get("properties", {})
-        t = p.get("type", 99)
-        # Skip features whose floor is above FL100 (irrelevant for drones)
-        lower = p.get("lowerLimit", {})
-        unit = lower.get("unit", 1)  # 1=ft, 6=FL
-        val = lower.get("value") or 0
-        floor_ft = val * 100 if unit == 6 else val
-        if floor_ft > 10000 and t not in (1, 2, 3):
-            continue
-        results.append((type_prio.get(t, 99), feat))
-
-    results.sort(key=lambda x: x[0])
-    return [f for _, f in results[:250]]
+    query = shapely.box(lon - delta, lat - delta, lon + delta, lat + delta)
+    # Sorted so equal priorities keep their original feature order
+    hits = np.sort(index["tree"].query(query))
+    order = hits[np.argsort(index["prio"][hits], kind="stable")]
+    features = index["features"]
+    return [orjson.loads(zlib.decompress(features[i])) for i in order[:_OPENAIP_MAX_FEATURES]]
 
 
 # ── WMO Weather Codes ───────────────────────────────────────────────
@@ -303,6 +510,7 @@ WMO = {
     96: ("Thunderstorm + hail", "wi-thunderstorm", "storm"),
     99: ("Thunderstorm + heavy hail", "wi-thunderstorm", "storm"),
 }
+_WMO_DESC_TO_GROUP = {desc: grp for desc, _icon, grp in WMO.values()}
 
 WIND_DIRS = [
     "N",
@@ -324,9 +532,15 @@ WIND_DIRS = [
 ]
 
 
-def decode_wmo(code):
-    d = WMO.get(code, ("Unknown", "wi-na", "unknown"))
-    return {"desc": d[0], "icon": d[1], "group": d[2]}
+class WMOEntry(NamedTuple):
+    desc: str
+    icon: str
+    group: str
+
+
+@lru_cache(maxsize=64)
+def decode_wmo(code) -> WMOEntry:
+    return WMOEntry(*WMO.get(code, ("Unknown", "wi-na", "unknown")))
 
 
 def wind_dir_label(deg):
@@ -343,45 +557,54 @@ def meters_to_ft(m):
     return round(m * 3.28084)
 
 
-def _civil_twilight_utc(lat: float, lon: float, date_str: str) -> tuple[str | None, str | None]:
-    """Return (civil_dawn_utc_iso, civil_dusk_utc_iso) for the given date.
+def _solar_noon_and_ha(doys: np.ndarray, lat: float, lon: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return (solar_noon_utc_h, civil_ha_h) arrays for an array of days of year.
 
-    Uses the NOAA/Spencer solar position algorithm.  Returns (None, None) for
-    polar regions where civil twilight does not occur.
+    Uses the NOAA/Spencer solar position algorithm, evaluated for all days at
+    once.  civil_ha_h is NaN on days where civil twilight does not occur.
     """
-    date = datetime.date.fromisoformat(date_str[:10])
-    doy = date.timetuple().tm_yday
-    _b = 2 * math.pi * (doy - 1) / 365
+    _b = 2 * np.pi * (doys - 1) / 365
     # Solar declination — Spencer 1971
-    dec = math.degrees(
+    dec = np.degrees(
         0.006918
-        - 0.399912 * math.cos(_b)
-        + 0.070257 * math.sin(_b)
-        - 0.006758 * math.cos(2 * _b)
-        + 0.000907 * math.sin(2 * _b)
-        - 0.002697 * math.cos(3 * _b)
-        + 0.001480 * math.sin(3 * _b)
+        - 0.399912 * np.cos(_b)
+        + 0.070257 * np.sin(_b)
+        - 0.006758 * np.cos(2 * _b)
+        + 0.000907 * np.sin(2 * _b)
+        - 0.002697 * np.cos(3 * _b)
+        + 0.001480 * np.sin(3 * _b)
     )
     # Equation of time (minutes)
     eot = 229.18 * (
         0.000075
-        + 0.001868 * math.cos(_b)
-        - 0.032077 * math.sin(_b)
-        - 0.014615 * math.cos(2 * _b)
-        - 0.040890 * math.sin(2 * _b)
+        + 0.001868 * np.cos(_b)
+        - 0.032077 * np.sin(_b)
+        - 0.014615 * np.cos(2 * _b)
+        - 0.040890 * np.sin(2 * _b)
     )
     solar_noon_utc = 12.0 - lon / 15.0 - eot / 60.0
     lat_r = math.radians(lat)
-    dec_r = math.radians(dec)
+    dec_r = np.radians(dec)
     # Zenith angle for civil twilight = 96° (sun 6° below horizon)
-    cos_ha = (math.cos(math.radians(96)) - math.sin(lat_r) * math.sin(dec_r)) / (
-        math.cos(lat_r) * math.cos(dec_r)
+    cos_ha = (math.cos(math.radians(96)) - math.sin(lat_r) * np.sin(dec_r)) / (
+        math.cos(lat_r) * np.cos(dec_r)
     )
-    if abs(cos_ha) > 1:
-        return None, None
-    ha_h = math.degrees(math.acos(cos_ha)) / 15.0
+    cos_ha[np.abs(cos_ha) > 1] = np.nan
+    return solar_noon_utc, np.degrees(np.arccos(cos_ha)) / 15.0
+
+
+def _civil_twilight_utc_batch(
+    lat: float, lon: float, date_strs: list[str]
+) -> list[tuple[str | None, str | None]]:
+    """Return [(civil_dawn_utc_iso, civil_dusk_utc_iso), ...] for each date.
 
-    def _to_iso(utc_h: float) -> str:
+    Days in polar regions where civil twilight does not occur get (None, None).
+    """
+    dates = [datetime.date.fromisoformat(s[:10]) for s in date_strs]
+    doys = np.array([d.timetuple().tm_yday for d in dates], dtype=np.float64)
+    solar_noon_utc, ha_h = _solar_noon_and_ha(doys, lat, lon)
+
+    def _to_iso(date: datetime.date, utc_h: float) -> str:
         utc_h = utc_h % 24
         h, rem = divmod(utc_h, 1)
         m, srem = divmod(rem * 60, 1)
@@ -396,7 +619,10 @@ def _civil_twilight_utc(lat: float, lon: float, date_str: str) -> tuple[str | No
             tzinfo=datetime.UTC,
         ).isoformat()
 
-    return _to_iso(solar_noon_utc - ha_h), _to_iso(solar_noon_utc + ha_h)
+    return [
+        (None, None) if math.isnan(ha) else (_to_iso(date, noon - ha), _to_iso(date, noon + ha))
+        for date, noon, ha in zip(dates, solar_noon_utc.tolist(), ha_h.tolist(), strict=True)
+    ]
 
 
 # ── METAR Decoder ───────────────────────────────────────────────────
@@ -611,87 +837,79 @@ def _temp_factor(temp):
     return _factor("Temperature", f"{round(temp)}°C", "danger", note)
 
 
-def assess_drone(weather_data):  # noqa: C901
+def assess_drone(weather_data):
     """Evaluate current conditions for drone/UAV flying."""
     c = weather_data["current"]
-    factors = []
-
     ws = c.get("wind_speed") or 0
-    factors.append(_wind_factor(ws * 1.852, ws))
-
     wg = c.get("wind_gusts") or 0
-    factors.append(_gust_factor(wg * 1.852, wg))
-
-    ratio_f = _gust_ratio_factor(ws, wg)
-    if ratio_f:
-        factors.append(ratio_f)
-
     ws_80m = c.get("wind_80m")
-    if ws_80m is not None:
-        shear_f = _wind_shear_factor(ws, ws_80m)
-        if shear_f:
-            factors.append(shear_f)
-
     precip = c.get("precip") or 0
     group = c.get("group", "clear")
-    factors.append(_precip_factor(precip, group))
-    factors.append(_cloud_factor(c.get("cloud_cover") or 0))
     temp = c.get("temp") or 0
-    factors.append(_temp_factor(temp))
-
     elev_m = weather_data.get("elevation")
-    if elev_m is not None:
-        pressure = c.get("pressure") or 1013.25
-        factors.append(_density_alt_factor(temp, pressure, elev_m))
 
+    shear = _wind_shear_factor(ws, ws_80m) if ws_80m is not None else None
+    density = (
+        _density_alt_factor(temp, c.get("pressure") or 1013.25, elev_m)
+        if elev_m is not None
+        else None
+    )
     if group == "storm":
-        factors.append(
-            _factor(
-                "Severe Weather",
-                c.get("desc", "Thunderstorm"),
-                "danger",
-                "Thunderstorms — do NOT fly",
-            )
+        severe = _factor(
+            "Severe Weather", c.get("desc", "Thunderstorm"), "danger", "Thunderstorms — do NOT fly"
         )
     elif group == "fog":
-        factors.append(
-            _factor("Visibility", "Fog", "danger", "Fog — cannot maintain visual line of sight")
+        severe = _factor(
+            "Visibility", "Fog", "danger", "Fog — cannot maintain visual line of sight"
         )
+    else:
+        severe = None
+
+    # Optional factors come back as None when they don't apply
+    factors = [
+        f
+        for f in (
+            _wind_factor(ws * 1.852, ws),
+            _gust_factor(wg * 1.852, wg),
+            _gust_ratio_factor(ws, wg),
+            shear,
+            _precip_factor(precip, group),
+            _cloud_factor(c.get("cloud_cover") or 0),
+            _temp_factor(temp),
+            density,
+            severe,
+        )
+        if f
+    ]
 
-    statuses = [f["status"] for f in factors]
-    if "danger" in statuses:
+    statuses = Counter(f["status"] for f in factors)
+    if statuses["danger"]:
         verdict, color, summary = "NO-GO", "red", "Conditions are unsafe for drone flight"
-    elif statuses.count("caution") >= 2:
+    elif statuses["caution"] >= 2:
         verdict, color, summary = (
             "MARGINAL",
             "amber",
             "Fly with caution — multiple limiting factors",
         )
-    elif "caution" in statuses:
+    elif statuses["caution"]:
         verdict, color, summary = "MARGINAL", "amber", "Mostly OK but check limiting factors"
     else:
         verdict, color, summary = "GO", "green", "Conditions are good for drone flight"
 
     # Hourly fly-window (next 24h)
     hourly_verdicts = []
+    desc_to_group = _WMO_DESC_TO_GROUP.get
     for h in weather_data.get("hourly", []):
         hw = h.get("wind", 0) * 1.852
         hg = h.get("gusts", 0) * 1.852
         hp = h.get("precip_prob", 0)
-        hgroup = "clear"
-        hdesc = h.get("desc", "")
-        for _code, (wdesc, _icon, wgrp) in WMO.items():
-            if wdesc == hdesc:
-                hgroup = wgrp
-                break
-        block = hw > 35 or hg > 45 or hgroup in ("storm", "fog")
-        issues = sum([hw > 20, hg > 30, hgroup in ("rain", "snow"), hp > 60])
-        if block:
+        hgroup = desc_to_group(h.get("desc", ""), "clear")
+        if hw > 35 or hg > 45 or hgroup in ("storm", "fog"):
             status = "danger"
-        elif issues >= 2:
-            status = "caution"
         else:
-            status = "good"
+            # Bools add as ints — no per-hour temporary list
+            issues = (hw > 20) + (hg > 30) + (hgroup in ("rain", "snow")) + (hp > 60)
+            status = "caution" if issues >= 2 else "good"
         hourly_verdicts.append({"time": h["time"], "status": status})
 
     return {
@@ -703,6 +921,151 @@ def assess_drone(weather_data):  # noqa: C901
     }
 
 
+# ── Upstream fetch helpers ──────────────────────────────────────────
+def _fetch_json(url: str, params: dict | None = None, timeout: float = 10, **kwargs) -> tuple:
+    """GET url on the shared session and decode JSON.
+
+    Returns (status_code, data), or (None, None) on a network or decode error so
+    it can run on _executor without raising into the caller.
+    """
+    try:
+        r = _session.get(url, params=params, timeout=timeout, **kwargs)
+        if r.status_code != 200:
+            return r.status_code, None
+        return r.status_code, orjson.loads(r.content)
+    except (requests.RequestException, orjson.JSONDecodeError):
+        return None, None
+
+
+# Single-flight: concurrent callers asking for the same key share one upstream call
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(key: tuple, fn, *args, **kwargs):
+    """Call fn(*args, **kwargs), or wait for the identical call already in flight.
+
+    The first caller runs fn on its own thread (never queued on _executor, so a
+    follower blocking inside a pool worker cannot starve it).
+    """
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        leader = fut is None
+        if leader:
+            fut = _inflight[key] = Future()
+    if not leader:
+        return fut.result()
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+# aviationweather.gov products change at most every few minutes, so identical
+# queries inside _AW_TTL are answered from memory.  Cached payloads are shared
+# between requests — callers must treat them as read-only.
+_aw_cache: OrderedDict = OrderedDict()
+_aw_lock = threading.Lock()
+_AW_TTL = 60  # seconds
+_AW_MAX_ENTRIES = 2048
+
+
+def _cached_fetch_json(url: str, params: dict, timeout: float = 10) -> tuple:
+    """_fetch_json behind the short aviationweather.gov TTL cache.
+
+    Only 200 responses are cached; the key is the URL plus the sorted params.
+    Concurrent misses for the same key share one request.
+    """
+    key = (url, tuple(sorted(params.items())))
+    now = time.time()
+    with _aw_lock:
+        hit = _aw_cache.get(key)
+        if hit and now - hit[0] < _AW_TTL:
+            _aw_cache.move_to_end(key)
+            return 200, hit[1]
+    status, data = _single_flight(key, _fetch_json, url, params=params, timeout=timeout)
+    if status == 200:
+        with _aw_lock:
+            _aw_cache[key] = (now, data)
+            _aw_cache.move_to_end(key)
+            while len(_aw_cache) > _AW_MAX_ENTRIES:
+                _aw_cache.popitem(last=False)
+    return status, data
+
+
+def _openaip_for_location(country: str, lat: float, lon: float) -> tuple:
+    """Resolve the OpenAIP country for a location and fetch its index.
+
+    Infers the country from coordinates if not supplied (handles bookmarks / old
+    URLs).  Returns (country, index, was_cached, cache_ts).
+    """
+    if not country or not _valid_country(country):
+        country = _country_from_latlon(lat, lon)
+    if country and _valid_country(country):
+        return country, *fetch_openaip(country)
+    return country, None, False, None
+
+
+@cache
+def _etree():
+    """Import lxml.etree on first use — only the NOTAM XML fallback needs it."""
+    from lxml import etree  # noqa: PLC0415
+
+    return etree
+
+
+def _safe_xml_parser(tag: str | None = None):
+    """Return a fresh XXE-safe pull parser: no entity expansion, no network, no huge trees.
+
+    Only end events for `tag` are reported when given.  lxml parsers must not be
+    shared between threads, so build one per parse.
+    """
+    return _etree().XMLPullParser(
+        events=("end",), tag=tag, resolve_entities=False, no_network=True, huge_tree=False
+    )
+
+
+_XML_MAX_BYTES = 500_000
+
+
+def _stream_xml_events(r, parser, max_bytes: int = _XML_MAX_BYTES):
+    """Feed a streamed response into a pull parser, yielding events as they complete.
+
+    Raises ValueError as soon as the declared or received body exceeds max_bytes,
+    before the rest of it is downloaded.
+    """
+    if int(r.headers.get("Content-Length") or 0) > max_bytes:
+        raise ValueError("XML response too large")
+    received = 0
+    for chunk in r.iter_content(chunk_size=16_384):
+        received += len(chunk)
+        if received > max_bytes:
+            raise ValueError("XML response too large")
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _stream_json_items(r, prefix: str):
+    """Yield the objects under `prefix` from a streamed JSON response as they complete."""
+    items = ijson.sendable_list()
+    coro = ijson.items_coro(items, prefix)
+    for chunk in r.iter_content(chunk_size=16_384):
+        coro.send(chunk)
+        yield from items
+        items.clear()
+    coro.close()
+    yield from items
+
+
 # ── Routes ──────────────────────────────────────────────────────────
 @app.route("/")
 def index():
@@ -737,10 +1100,10 @@ def api_search():
                     "population": x.get("population"),
                     "timezone": x.get("timezone", ""),
                 }
-                for x in r.json().get("results", [])
+                for x in orjson.loads(r.content).get("results", [])
             ]
         )
-    except requests.RequestException:
+    except (requests.RequestException, orjson.JSONDecodeError):
         logger.exception("Search API error for query %r", q)
         return jsonify({"error": "Search unavailable"}), 502
 
@@ -804,8 +1167,8 @@ def api_weather():
             timeout=10,
         )
         r.raise_for_status()
-        data = r.json()
-    except requests.RequestException:
+        data = orjson.loads(r.content)
+    except (requests.RequestException, orjson.JSONDecodeError):
         logger.exception("Weather API error lat=%s lon=%s", lat, lon)
         return jsonify({"error": "Weather data unavailable"}), 502
 
@@ -814,57 +1177,82 @@ def api_weather():
         return jsonify({"error": "Unexpected response from weather API"}), 502
     wmo = decode_wmo(c.get("weather_code", 0))
 
-    hourly = []
     h = data.get("hourly", {})
-    times = h.get("time", [])
-    wind_80m_vals = h.get("wind_speed_80m", [None] * len(times))
-    for i in range(len(times)):
-        try:
-            hw = decode_wmo(h["weather_code"][i])
-            hourly.append(
-                {
-                    "time": times[i],
-                    "temp": h["temperature_2m"][i],
-                    "precip_prob": h["precipitation_probability"][i],
-                    "icon": hw["icon"],
-                    "desc": hw["desc"],
-                    "group": hw["group"],
-                    "wind": h["wind_speed_10m"][i],
-                    "gusts": h["wind_gusts_10m"][i],
-                    "wind_80m": wind_80m_vals[i] if i < len(wind_80m_vals) else None,
-                }
-            )
-        except (KeyError, IndexError):
-            continue
+    # wind_speed_80m may be missing or shorter than the other series; pad with None
+    wind_80m_vals = chain(h.get("wind_speed_80m", ()), repeat(None))
+    hourly = [
+        {
+            "time": t,
+            "temp": temp,
+            "precip_prob": precip_prob,
+            "icon": hw.icon,
+            "desc": hw.desc,
+            "group": hw.group,
+            "wind": wind,
+            "gusts": gusts,
+            "wind_80m": wind_80m,
+        }
+        for t, temp, precip_prob, hw, wind, gusts, wind_80m in zip(
+            h.get("time", []),
+            h.get("temperature_2m", []),
+            h.get("precipitation_probability", []),
+            map(decode_wmo, h.get("weather_code", [])),
+            h.get("wind_speed_10m", []),
+            h.get("wind_gusts_10m", []),
+            wind_80m_vals,
+            strict=False,
+        )
+    ]
 
     d = data.get("daily", {})
-    forecast = []
-    for i in range(len(d.get("time", []))):
-        try:
-            dw = decode_wmo(d["weather_code"][i])
-            date_str = d["time"][i]
-            civil_dawn, civil_dusk = _civil_twilight_utc(lat, lon, date_str)
-            forecast.append(
-                {
-                    "date": date_str,
-                    "high": d["temperature_2m_max"][i],
-                    "low": d["temperature_2m_min"][i],
-                    "desc": dw["desc"],
-                    "icon": dw["icon"],
-                    "group": dw["group"],
-                    "precip": d["precipitation_sum"][i],
-                    "precip_prob": d.get("precipitation_probability_max", [None] * 7)[i],
-                    "wind_max": d["wind_speed_10m_max"][i],
-                    "gusts_max": d["wind_gusts_10m_max"][i],
-                    "sunrise": d["sunrise"][i],
-                    "sunset": d["sunset"][i],
-                    "uv": d.get("uv_index_max", [None] * 7)[i],
-                    "civil_dawn": civil_dawn,
-                    "civil_dusk": civil_dusk,
-                }
-            )
-        except (KeyError, IndexError):
-            continue
+    dates = d.get("time", [])
+    forecast = [
+        {
+            "date": date_str,
+            "high": high,
+            "low": low,
+            "desc": dw.desc,
+            "icon": dw.icon,
+            "group": dw.group,
+            "precip": precip,
+            "precip_prob": precip_prob,
+            "wind_max": wind_max,
+            "gusts_max": gusts_max,
+            "sunrise": sunrise,
+            "sunset": sunset,
+            "uv": uv,
+            "civil_dawn": civil_dawn,
+            "civil_dusk": civil_dusk,
+        }
+        for (
+            date_str,
+            high,
+            low,
+            dw,
+            precip,
+            precip_prob,
+            wind_max,
+            gusts_max,
+            sunrise,
+            sunset,
+            uv,
+            (civil_dawn, civil_dusk),
+        ) in zip(
+            dates,
+            d.get("temperature_2m_max", []),
+            d.get("temperature_2m_min", []),
+            map(decode_wmo, d.get("weather_code", [])),
+            d.get("precipitation_sum", []),
+            d.get("precipitation_probability_max", [None] * 7),
+            d.get("wind_speed_10m_max", []),
+            d.get("wind_gusts_10m_max", []),
+            d.get("sunrise", []),
+            d.get("sunset", []),
+            d.get("uv_index_max", [None] * 7),
+            _civil_twilight_utc_batch(lat, lon, dates),
+            strict=False,
+        )
+    ]
 
     # wind_80m is hourly-only; use first slot as a current proxy
     wind_80m_current = hourly[0]["wind_80m"] if hourly else None
@@ -885,7 +1273,7 @@ def api_weather():
             "is_day": c.get("is_day", 1),
             "weather_code": c.get("weather_code", 0),
             "wind_80m": wind_80m_current,
-            **wmo,
+            **wmo._asdict(),
         },
         "hourly": hourly,
         "forecast": forecast,
@@ -897,22 +1285,138 @@ def api_weather():
     return jsonify(result)
 
 
+_NOTAM_FAA = ("https://notams.aim.faa.gov/notamSearch/", "FAA NOTAM Search")
+_NOTAM_EAD = ("https://www.ead.eurocontrol.int/", "EUROCONTROL EAD")
+# Two-letter prefixes are checked before the first-letter table
+_NOTAM_PORTAL_BY_PREFIX = {
+    "EG": ("https://nats-uk.ead-it.com/cms-nats/opencms/en/NOTAM/", "UK AIS NOTAM"),
+    "NZ": ("https://aip.airways.co.nz/", "Airways NZ"),
+}
+_NOTAM_PORTAL_BY_FIRST = {
+    "K": _NOTAM_FAA,
+    "P": _NOTAM_FAA,
+    "C": ("https://www.navcanada.ca/en/notam.aspx", "NAV CANADA"),
+    "E": _NOTAM_EAD,
+    "L": _NOTAM_EAD,
+    "B": _NOTAM_EAD,
+    "Y": ("https://www.airservicesaustralia.com/naips/", "NAIPS Australia"),
+}
+_NOTAM_PORTAL_DEFAULT = ("https://www.icao.int/safety/airnavigation/NOTAM/", "ICAO NOTAM")
+
+
 def _notam_portal(station: str) -> tuple[str, str]:
     """Return (url, label) for the public NOTAM portal serving this ICAO station."""
     s = station.upper()
-    if s.startswith("K") or s.startswith("P"):
-        return "https://notams.aim.faa.gov/notamSearch/", "FAA NOTAM Search"
-    if s.startswith("C"):
-        return "https://www.navcanada.ca/en/notam.aspx", "NAV CANADA"
-    if s.startswith("EG"):
-        return "https://nats-uk.ead-it.com/cms-nats/opencms/en/NOTAM/", "UK AIS NOTAM"
-    if s[0] in ("E", "L", "B"):
-        return "https://www.ead.eurocontrol.int/", "EUROCONTROL EAD"
-    if s.startswith("Y"):
-        return "https://www.airservicesaustralia.com/naips/", "NAIPS Australia"
-    if s.startswith("NZ"):
-        return "https://aip.airways.co.nz/", "Airways NZ"
-    return "https://www.icao.int/safety/airnavigation/NOTAM/", "ICAO NOTAM"
+    return _NOTAM_PORTAL_BY_PREFIX.get(s[:2]) or _NOTAM_PORTAL_BY_FIRST.get(
+        s[:1], _NOTAM_PORTAL_DEFAULT
+    )
+
+
+def _notams_navcanada(station: str) -> list | None:
+    """NAV CANADA NOTAMs for a CY** airport, or None if the fetch failed."""
+    try:
+        r = _session.get(
+            "https://plan.navcanada.ca/weather/api/alpha/",
+            params={"site": station, "alpha": "notam"},
+            headers={"User-Agent": "UAVChum/1.0"},
+            timeout=15,
+        )
+        r.raise_for_status()
+        found = []
+        for item in orjson.loads(r.content).get("data", []):
+            if item.get("type") != "notam":
+                continue
+            try:
+                raw = orjson.loads(item.get("text", "{}")).get("raw", "")
+            except (ValueError, AttributeError):
+                raw = item.get("text", "")
+            if raw:
+                found.append({"raw": raw, "source": "NAV CANADA"})
+        return found[:60]
+    except (requests.RequestException, orjson.JSONDecodeError):
+        logger.warning("NAV CANADA NOTAM fetch failed for %s", station)
+        return None
+
+
+def _notams_anb(station: str) -> list:
+    """ANB Data NOTAMs (free, no auth, global ICAO coverage); empty on failure."""
+    try:
+        with _session.get(
+            "https://api.anbdata.com/anb/states/notams/notams-list",
+            params={"client_id": "test", "icao_location": station},
+            headers={"User-Agent": "UAVChum/1.0"},
+            timeout=10,
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            # ANB returns the entire country dataset regardless of the requested
+            # station — stream it and keep only NOTAMs whose location matches.
+            found = []
+            for n in _stream_json_items(r, "item"):
+                if n.get("location", "").upper() != station:
+                    continue
+                raw = n.get("all") or n.get("message") or ""
+                if raw:
+                    found.append({"raw": raw, "source": "ANB"})
+                    if len(found) >= 60:
+                        break
+            return found
+    except (requests.RequestException, ijson.JSONError):
+        logger.warning("ANB NOTAM fetch failed for %s", station)
+        return []
+
+
+def _notams_awc_xml(station: str) -> list:
+    """SIGMETs mentioning the station from the AWC XML dataserver."""
+    etree = _etree()
+    found: list = []
+    try:
+        with _session.get(
+            "https://aviationweather.gov/api/data/dataserver",
+            params={
+                "requestType": "retrieve",
+                "dataSource": "airsigmets",
+                "stationString": station,
+                "hoursBeforeNow": "24",
+                "format": "xml",
+            },
+            timeout=10,
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            # Parse while downloading and drop each report once read
+            for _, elem in _stream_xml_events(r, _safe_xml_parser("AIRSIGMET")):
+                raw = elem.findtext("raw_text", "")
+                if raw and station in raw:
+                    found.append({"raw": raw, "source": "AWC SIGMET/AIRMET"})
+                # Cleared elements still hang off the parent — unlink them too
+                elem.clear(keep_tail=False)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    except (requests.RequestException, ValueError, etree.XMLSyntaxError):
+        logger.warning("NOTAM XML fallback failed for %s", station)
+    return found
+
+
+def _fetch_notams(station: str) -> tuple[list, str | None]:
+    """Walk the keyless NOTAM sources for a station until one returns data.
+
+    Returns (notams, source); runs on _executor alongside the weather fetches.
+    """
+    notams: list = []
+    source = None
+    if station.startswith("C"):
+        found = _notams_navcanada(station)
+        if found is not None:
+            notams, source = found, "NAV CANADA"
+    if not notams:
+        found = _notams_anb(station)
+        if found:
+            notams, source = found, "ANB"
+    # Fallback: pull any SIGMETs mentioning the station from the XML dataserver
+    if not notams:
+        notams = _notams_awc_xml(station)
+    return notams, source
 
 
 @app.route("/api/aviation")
@@ -932,42 +1436,51 @@ def api_aviation():  # noqa: C901
         "notams": [],
     }
 
+    # Every upstream is independent — fetch them concurrently; the NOTAM
+    # sources fall back on one another so they run as a single chain.
+    metar_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/metar",
+        params={"ids": station, "format": "json", "hours": 6},
+    )
+    taf_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/taf",
+        params={"ids": station, "format": "json"},
+    )
+    sigmet_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/airsigmet",
+        params={"format": "json"},
+    )
+    pirep_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/pirep",
+        params={"id": station, "format": "json", "distance": 100, "age": 3},
+    )
+    notam_f = _executor.submit(_single_flight, ("notams", station), _fetch_notams, station)
+
     # METAR
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/metar",
-            params={"ids": station, "format": "json", "hours": 6},
-            timeout=10,
-        )
-        r.raise_for_status()
-        metars = r.json() or []
-        result["metar"] = metars
-        if metars:
-            result["metar_decoded"] = decode_metar(metars[0])
-    except requests.RequestException:
+    status, metars = metar_f.result()
+    if status != 200:
         logger.warning("METAR fetch failed for %s", station)
+    elif metars:
+        result["metar"] = metars
+        result["metar_decoded"] = decode_metar(metars[0])
 
     # TAF
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/taf",
-            params={"ids": station, "format": "json"},
-            timeout=10,
-        )
-        r.raise_for_status()
-        result["taf"] = r.json() or []
-    except requests.RequestException:
+    status, tafs = taf_f.result()
+    if status != 200:
         logger.warning("TAF fetch failed for %s", station)
+    else:
+        result["taf"] = tafs or []
 
     # SIGMET/AIRMET
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/airsigmet",
-            params={"format": "json"},
-            timeout=10,
-        )
-        r.raise_for_status()
-        all_alerts = r.json() or []
+    status, all_alerts = sigmet_f.result()
+    if status != 200:
+        logger.warning("SIGMET fetch failed for %s", station)
+    else:
+        all_alerts = all_alerts or []
         if result["metar_decoded"] and result["metar_decoded"].get("lat"):
             slat = result["metar_decoded"]["lat"]
             slon = result["metar_decoded"]["lon"]
@@ -980,94 +1493,15 @@ def api_aviation():  # noqa: C901
             result["airsigmet"] = nearby
         else:
             result["airsigmet"] = all_alerts[:20]
-    except requests.RequestException:
-        logger.warning("SIGMET fetch failed for %s", station)
 
     # PIREPs
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/pirep",
-            params={"id": station, "format": "json", "distance": 100, "age": 3},
-            timeout=10,
-        )
-        r.raise_for_status()
-        result["pireps"] = (r.json() or [])[:20]
-    except requests.RequestException:
+    status, pireps = pirep_f.result()
+    if status != 200:
         logger.warning("PIREP fetch failed for %s", station)
+    else:
+        result["pireps"] = (pireps or [])[:20]
 
-    # NOTAMs — NAV CANADA for CY** airports
-    result["notam_source"] = None
-    if station.startswith("C"):
-        try:
-            r = _session.get(
-                "https://plan.navcanada.ca/weather/api/alpha/",
-                params={"site": station, "alpha": "notam"},
-                headers={"User-Agent": "UAVChum/1.0"},
-                timeout=15,
-            )
-            r.raise_for_status()
-            notams = []
-            for item in r.json().get("data", []):
-                if item.get("type") != "notam":
-                    continue
-                try:
-                    raw = json.loads(item.get("text", "{}")).get("raw", "")
-                except (ValueError, AttributeError):
-                    raw = item.get("text", "")
-                if raw:
-                    notams.append({"raw": raw, "source": "NAV CANADA"})
-            result["notams"] = notams[:60]
-            result["notam_source"] = "NAV CANADA"
-        except requests.RequestException:
-            logger.warning("NAV CANADA NOTAM fetch failed for %s", station)
-
-    # Primary international: ANB Data (free, no auth, global ICAO coverage)
-    if not result["notams"]:
-        try:
-            r = _session.get(
-                "https://api.anbdata.com/anb/states/notams/notams-list",
-                params={"client_id": "test", "icao_location": station},
-                headers={"User-Agent": "UAVChum/1.0"},
-                timeout=10,
-            )
-            r.raise_for_status()
-            for n in r.json() or []:
-                # ANB returns the entire country dataset regardless of the requested
-                # station — filter to only NOTAMs whose location matches this station.
-                if n.get("location", "").upper() != station:
-                    continue
-                raw = n.get("all") or n.get("message") or ""
-                if raw:
-                    result["notams"].append({"raw": raw, "source": "ANB"})
-            if result["notams"]:
-                result["notam_source"] = "ANB"
-        except requests.RequestException:
-            logger.warning("ANB NOTAM fetch failed for %s", station)
-
-    # Fallback: pull any SIGMETs mentioning the station from the XML dataserver
-    if not result["notams"]:
-        try:
-            r = _session.get(
-                "https://aviationweather.gov/api/data/dataserver",
-                params={
-                    "requestType": "retrieve",
-                    "dataSource": "airsigmets",
-                    "stationString": station,
-                    "hoursBeforeNow": "24",
-                    "format": "xml",
-                },
-                timeout=10,
-            )
-            r.raise_for_status()
-            # Guard against excessively large responses
-            if len(r.text) < 500_000:
-                root = ET.fromstring(r.text)
-                for elem in root.iter("AIRSIGMET"):
-                    raw = elem.findtext("raw_text", "")
-                    if raw and station in raw:
-                        result["notams"].append({"raw": raw, "source": "AWC SIGMET/AIRMET"})
-        except (requests.RequestException, ET.ParseError):
-            logger.warning("NOTAM XML fallback failed for %s", station)
+    result["notams"], result["notam_source"] = notam_f.result()
 
     if not result["notams"]:
         portal_url, portal_label = _notam_portal(station)
@@ -1094,135 +1528,134 @@ def api_airspace():  # noqa: C901
     delta = 1.5  # ~165 km box
     bbox_env = f"{lon - delta},{lat - delta},{lon + delta},{lat + delta}"
     result: dict = {"airspace": [], "tfrs": [], "uasfm": [], "airports": []}
+    country = request.args.get("country", "").strip().upper()
+
+    # All upstreams are independent — fetch them concurrently
+    airspace_f = _executor.submit(
+        _fetch_json,
+        "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services"
+        "/Class_Airspace/FeatureServer/0/query",
+        params={
+            "where": "CLASS IN ('B','C','D')",
+            "geometry": bbox_env,
+            "geometryType": "esriGeometryEnvelope",
+            "spatialRel": "esriSpatialRelIntersects",
+            "outFields": (
+                "CLASS,NAME,IDENT,LOWER_VAL,UPPER_VAL,LOWER_UOM,UPPER_UOM,LOWER_CODE,UPPER_CODE"
+            ),
+            "f": "geojson",
+            "resultRecordCount": 100,
+        },
+    )
+    uasfm_f = _executor.submit(
+        _fetch_json,
+        "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services"
+        "/FAA_UAS_FacilityMap_Data_Primary/FeatureServer/0/query",
+        params={
+            "where": "1=1",
+            "geometry": bbox_env,
+            "geometryType": "esriGeometryEnvelope",
+            "spatialRel": "esriSpatialRelIntersects",
+            "outFields": "CEILING,UNIT,APT1_ICAO,APT1_NAME,AIRSPACE_1",
+            "f": "geojson",
+            "resultRecordCount": 200,
+        },
+    )
+    tfr_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/tfr",
+        params={"format": "json"},
+        timeout=8,
+    )
+    metar_f = _executor.submit(
+        _cached_fetch_json,
+        "https://aviationweather.gov/api/data/metar",
+        params={
+            "bbox": f"{lat - delta},{lon - delta},{lat + delta},{lon + delta}",
+            "format": "json",
+            "hours": 2,
+        },
+    )
+    openaip_f = _executor.submit(_openaip_for_location, country, lat, lon)
 
     # FAA Controlled Airspace Class B / C / D
-    try:
-        r = _session.get(
-            "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services"
-            "/Class_Airspace/FeatureServer/0/query",
-            params={
-                "where": "CLASS IN ('B','C','D')",
-                "geometry": bbox_env,
-                "geometryType": "esriGeometryEnvelope",
-                "spatialRel": "esriSpatialRelIntersects",
-                "outFields": (
-                    "CLASS,NAME,IDENT,LOWER_VAL,UPPER_VAL,LOWER_UOM,UPPER_UOM,LOWER_CODE,UPPER_CODE"
-                ),
-                "f": "geojson",
-                "resultRecordCount": 100,
-            },
-            timeout=10,
-        )
-        if r.status_code == 200:
-            for feat in r.json().get("features", []):
-                cls = feat.get("properties", {}).get("CLASS", "")
-                feat["properties"]["_class"] = cls
-                result["airspace"].append(feat)
-    except requests.RequestException:
+    status, data = airspace_f.result()
+    if status is None:
         logger.warning("FAA class airspace fetch failed lat=%s lon=%s", lat, lon)
+    elif status == 200:
+        for feat in data.get("features", []):
+            cls = feat.get("properties", {}).get("CLASS", "")
+            feat["properties"]["_class"] = cls
+            result["airspace"].append(feat)
 
     # FAA UAS Facility Map (LAANC)
-    try:
-        r = _session.get(
-            "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services"
-            "/FAA_UAS_FacilityMap_Data_Primary/FeatureServer/0/query",
-            params={
-                "where": "1=1",
-                "geometry": bbox_env,
-                "geometryType": "esriGeometryEnvelope",
-                "spatialRel": "esriSpatialRelIntersects",
-                "outFields": "CEILING,UNIT,APT1_ICAO,APT1_NAME,AIRSPACE_1",
-                "f": "geojson",
-                "resultRecordCount": 200,
-            },
-            timeout=10,
-        )
-        if r.status_code == 200:
-            result["uasfm"] = r.json().get("features", [])
-    except requests.RequestException:
+    status, data = uasfm_f.result()
+    if status is None:
         logger.warning("FAA UASFM fetch failed lat=%s lon=%s", lat, lon)
+    elif status == 200:
+        result["uasfm"] = data.get("features", [])
 
     # TFRs
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/tfr",
-            params={"format": "json"},
-            timeout=8,
-        )
-        if r.status_code == 200:
-            nearby = []
-            for t in r.json() or []:
-                tlat = t.get("lat") or t.get("latitude")
-                tlon = t.get("lon") or t.get("longitude")
-                if tlat and tlon:
-                    try:
-                        if (
-                            abs(float(tlat) - lat) < delta + 0.5
-                            and abs(float(tlon) - lon) < delta + 0.5
-                        ):
-                            nearby.append(t)
-                    except (TypeError, ValueError):
+    status, data = tfr_f.result()
+    if status is None:
+        logger.warning("TFR fetch failed lat=%s lon=%s", lat, lon)
+    elif status == 200:
+        nearby = []
+        for t in data or []:
+            tlat = t.get("lat") or t.get("latitude")
+            tlon = t.get("lon") or t.get("longitude")
+            if tlat and tlon:
+                try:
+                    if (
+                        abs(float(tlat) - lat) < delta + 0.5
+                        and abs(float(tlon) - lon) < delta + 0.5
+                    ):
                         nearby.append(t)
-                else:
+                except (TypeError, ValueError):
                     nearby.append(t)
-            result["tfrs"] = nearby[:20]
-    except requests.RequestException:
-        logger.warning("TFR fetch failed lat=%s lon=%s", lat, lon)
+            else:
+                nearby.append(t)
+        result["tfrs"] = nearby[:20]
 
     # Nearby airports via METAR bbox
-    try:
-        r = _session.get(
-            "https://aviationweather.gov/api/data/metar",
-            params={
-                "bbox": f"{lat - delta},{lon - delta},{lat + delta},{lon + delta}",
-                "format": "json",
-                "hours": 2,
-            },
-            timeout=10,
-        )
-        if r.status_code == 200:
-            seen: set = set()
-            airports = []
-            for m in r.json() or []:
-                icao = m.get("icaoId", "")
-                if not icao or icao in seen or not m.get("lat") or not m.get("lon"):
-                    continue
-                seen.add(icao)
-                dm = decode_metar(m)
-                airports.append(
-                    {
-                        "icao": icao,
-                        "name": m.get("name", icao),
-                        "lat": m.get("lat"),
-                        "lon": m.get("lon"),
-                        "elev": dm.get("elevation_ft"),
-                        "flight_cat": dm.get("flight_cat"),
-                        "wind_dir": dm.get("wind_dir"),
-                        "wind_speed_kt": dm.get("wind_speed_kt"),
-                        "wind_gust_kt": dm.get("wind_gust_kt"),
-                        "visibility": dm.get("visibility"),
-                        "temp_c": dm.get("temp_c"),
-                        "clouds": dm.get("clouds"),
-                        "wx_string": dm.get("wx_string"),
-                        "raw": dm.get("raw"),
-                        "time": dm.get("time"),
-                    }
-                )
-            result["airports"] = airports[:40]
-    except requests.RequestException:
+    status, data = metar_f.result()
+    if status is None:
         logger.warning("Airport METAR fetch failed lat=%s lon=%s", lat, lon)
+    elif status == 200:
+        seen: set = set()
+        airports = []
+        for m in data or []:
+            if len(airports) == 40:
+                break
+            icao = m.get("icaoId", "")
+            if not icao or icao in seen or not m.get("lat") or not m.get("lon"):
+                continue
+            seen.add(icao)
+            dm = decode_metar(m)
+            airports.append(
+                {
+                    "icao": icao,
+                    "name": m.get("name", icao),
+                    "lat": m.get("lat"),
+                    "lon": m.get("lon"),
+                    "elev": dm.get("elevation_ft"),
+                    "flight_cat": dm.get("flight_cat"),
+                    "wind_dir": dm.get("wind_dir"),
+                    "wind_speed_kt": dm.get("wind_speed_kt"),
+                    "wind_gust_kt": dm.get("wind_gust_kt"),
+                    "visibility": dm.get("visibility"),
+                    "temp_c": dm.get("temp_c"),
+                    "clouds": dm.get("clouds"),
+                    "wx_string": dm.get("wx_string"),
+                    "raw": dm.get("raw"),
+                    "time": dm.get("time"),
+                }
+            )
+        result["airports"] = airports
 
-    # OpenAIP — infer country from coordinates if not supplied (handles bookmarks / old URLs)
-    country = request.args.get("country", "").strip().upper()
-    if not country or not _valid_country(country):
-        country = _country_from_latlon(round(lat), round(lon))
-    openaip_was_cached = False
-    openaip_ts = None
-    if country and _valid_country(country):
-        odata, openaip_was_cached, openaip_ts = fetch_openaip(country)
-        result["openaip"] = filter_openaip(odata, lat, lon, delta)
-    else:
-        result["openaip"] = []
+    # OpenAIP
+    country, oindex, openaip_was_cached, openaip_ts = openaip_f.result()
+    result["openaip"] = filter_openaip(oindex, lat, lon, delta)
 
     now_ts = int(time.time())
     result["sources"] = [
@@ -1276,9 +1709,9 @@ def api_station():
             timeout=10,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         return jsonify(data[0] if data else {})
-    except requests.RequestException:
+    except (requests.RequestException, orjson.JSONDecodeError):
         logger.exception("Station lookup failed for %s", station)
         return jsonify({"error": "Station data unavailable"}), 502
 
@@ -1288,7 +1721,7 @@ def api_station():
 def api_flightroute():
     """Proxy adsbdb.com callsign lookup — returns origin/destination/airline."""
     callsign = request.args.get("callsign", "").strip().upper()
-    if not callsign or not fullmatch(r"[A-Z0-9]{3,8}", callsign):
+    if not _CALLSIGN_RE.fullmatch(callsign):
         return jsonify({"error": "valid callsign required"}), 400
     try:
         r = _session.get(
@@ -1297,7 +1730,7 @@ def api_flightroute():
             timeout=8,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         route = data.get("response", {}).get("flightroute") or {}
         if not route:
             return jsonify({"found": False})
@@ -1310,7 +1743,7 @@ def api_flightroute():
                 "destination": _format_airport(route.get("destination")),
             }
         )
-    except requests.RequestException:
+    except (requests.RequestException, orjson.JSONDecodeError):
         logger.warning("flightroute lookup failed for %s", callsign)
         return jsonify({"found": False})
 
@@ -1327,6 +1760,43 @@ def _format_airport(ap: dict | None) -> dict:
     }
 
 
+_ADSB_HEDGE_DELAY = 0.5  # seconds to wait on a mirror before also asking the next
+
+
+def _first_success(urls: list, **kwargs):
+    """Hedged GET across mirrors; return the first 200 JSON body, or None.
+
+    The next mirror starts whenever the ones in flight have failed or stayed
+    silent for _ADSB_HEDGE_DELAY.  kwargs are passed through to _fetch_json.
+    """
+    mirrors = iter(urls)
+    pending: dict = {}
+    data = None
+    while data is None:
+        url = next(mirrors, None)
+        if url is not None:
+            pending[_executor.submit(_fetch_json, url, **kwargs)] = url
+        elif not pending:
+            break
+        done, _ = wait(
+            pending,
+            timeout=_ADSB_HEDGE_DELAY if url is not None else None,
+            return_when=FIRST_COMPLETED,
+        )
+        for f in done:
+            status, payload = f.result()
+            failed_url = pending.pop(f)
+            if status == 200 and payload is not None:
+                data = payload
+                break
+            logger.warning(
+                "ADS-B source failed %s: %s", failed_url, status or "request or decode error"
+            )
+    for f in pending:
+        f.cancel()
+    return data
+
+
 @app.route("/api/adsb")
 # Community ADS-B feeds — no auth, no rate limit issues.
 # Primary: adsb.lol (ODbL). Fallbacks: airplanes.live, opendata.adsb.fi.
@@ -1344,15 +1814,7 @@ def api_adsb():
         f"https://opendata.adsb.fi/api/v3/lat/{rlat}/lon/{rlon}/dist/{radius_nm}",
     ]
     _ua = {"User-Agent": "UAVChum/1.0 (uavchum.app)"}
-    data = None
-    for url in apis:
-        try:
-            r = _session.get(url, headers=_ua, timeout=8)
-            r.raise_for_status()
-            data = r.json()
-            break
-        except requests.RequestException as exc:
-            logger.warning("ADS-B source failed %s: %s", url, exc)
+    data = _first_success(apis, headers=_ua, timeout=8)
     if data is None:
         return jsonify({"aircraft": [], "count": 0}), 200
 
@@ -1386,8 +1848,17 @@ def api_adsb():
 
 
 # ── Lightning / Blitzortung ──────────────────────────────────────────────────
-_strikes: deque = deque(maxlen=100_000)
-_strikes_lock = threading.Lock()
+# Ring buffer of the most recent strikes, one array per field; _strike_head counts
+# every strike ever written, so the next slot is _strike_head % _STRIKE_CAPACITY.
+# _strike_claimed runs one ahead while a slot is being filled, so readers can tell
+# which slots changed under them.  The Blitzortung thread is the only writer, so
+# neither side takes a lock.
+_STRIKE_CAPACITY = 100_000
+_strike_lat = np.zeros(_STRIKE_CAPACITY)
+_strike_lon = np.zeros(_STRIKE_CAPACITY)
+_strike_ts = np.zeros(_STRIKE_CAPACITY)
+_strike_head = 0
+_strike_claimed = 0
 _blitzortung_connected = False
 _STRIKE_MAX_AGE = 30 * 60  # seconds
 
@@ -1400,15 +1871,55 @@ _BLITZORTUNG_URLS = [
 
 _EARTH_NM = 3440.065
 
+# Strike messages are small flat JSON objects, so the three fields we keep are
+# scanned for directly instead of building a dict per strike.  The nested "sig"
+# station list repeats the same keys, so searches stop where it begins.
+_JSON_NUM = r"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+_STRIKE_LAT_RE = re.compile(r'"lat"' + _JSON_NUM)
+_STRIKE_LON_RE = re.compile(r'"lon"' + _JSON_NUM)
+_STRIKE_TIME_RE = re.compile(r'"time"' + _JSON_NUM)
+
+
+def _parse_strike(message: str) -> tuple[float, float, float] | None:
+    """Return (lat, lon, epoch seconds) from a Blitzortung message, or None."""
+    end = message.find('"sig"')
+    if end < 0:
+        end = len(message)
+    lat = _STRIKE_LAT_RE.search(message, 0, end)
+    lon = _STRIKE_LON_RE.search(message, 0, end)
+    ts_ns = _STRIKE_TIME_RE.search(message, 0, end)
+    if lat is None or lon is None or ts_ns is None:
+        return None
+    return float(lat[1]), float(lon[1]), float(ts_ns[1]) / 1_000_000_000
 
-def _haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
-    )
-    return _EARTH_NM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+def _haversine_nm(lat1: float, lon1: float, lat2, lon2, cos_lat1: float | None = None):
+    """Great-circle distance in NM from one point; lat2/lon2 may be NumPy arrays.
+
+    The origin terms are scalar math done once; pass cos_lat1 if already known.
+    """
+    if cos_lat1 is None:
+        cos_lat1 = math.cos(math.radians(lat1))
+    lat2_r = np.radians(lat2)
+    dlat = lat2_r - math.radians(lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = np.sin(dlat / 2) ** 2 + cos_lat1 * np.cos(lat2_r) * np.sin(dlon / 2) ** 2
+    return _EARTH_NM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _store_strike(lat: float, lon: float, ts: float) -> None:
+    """Write one strike into the ring buffer, overwriting the oldest when full.
+
+    The slot is claimed and filled before the head advances, so readers never see
+    it early and can drop it if it changed while they copied.
+    """
+    global _strike_head, _strike_claimed
+    _strike_claimed = _strike_head + 1
+    i = _strike_head % _STRIKE_CAPACITY
+    _strike_lat[i] = lat
+    _strike_lon[i] = lon
+    _strike_ts[i] = ts
+    _strike_head += 1
 
 
 def _blitzortung_thread():  # noqa: C901
@@ -1437,16 +1948,11 @@ def _blitzortung_thread():  # noqa: C901
 
         def on_message(_ws, message):
             try:
-                d = json.loads(message)
-                lat = d.get("lat")
-                lon = d.get("lon")
-                ts_ns = d.get("time")
-                if lat is None or lon is None or ts_ns is None:
-                    return
-                with _strikes_lock:
-                    _strikes.append((float(lat), float(lon), ts_ns / 1_000_000_000))
-            except (json.JSONDecodeError, TypeError, ValueError):
-                pass
+                strike = _parse_strike(message)
+            except TypeError:  # binary frame
+                return
+            if strike is not None:
+                _store_strike(*strike)
 
         def on_open(_ws, _url=url):
             nonlocal did_connect
@@ -1498,30 +2004,57 @@ def api_lightning():
     radius_nm = request.args.get("radius_nm", default=150, type=float)
     if not _valid_lat(lat) or not _valid_lon(lon):
         return jsonify({"error": "valid lat/lon required"}), 400
+    if math.isnan(radius_nm):
+        return jsonify({"error": "valid radius_nm required"}), 400
     radius_nm = min(max(radius_nm, 10), 300)
-    cutoff = time.time() - _STRIKE_MAX_AGE
     now = time.time()
+    cutoff = now - _STRIKE_MAX_AGE
+
+    # Lock-free snapshot.  Copy the filled part of the ring, then drop the oldest
+    # slots the writer claimed meanwhile (indices head.._strike_claimed wrap onto
+    # them) and roll the rest back into arrival order.
+    head = _strike_head
+    n = min(head, _STRIKE_CAPACITY)
+    s_lat = _strike_lat[:n].copy()
+    s_lon = _strike_lon[:n].copy()
+    s_ts = _strike_ts[:n].copy()
+    torn = min(max(_strike_claimed - _STRIKE_CAPACITY - (head - n), 0), n)
+    s_lat, s_lon, s_ts = (np.roll(a, -head)[torn:] for a in (s_lat, s_lon, s_ts))
+
+    # Cheap box test first (1° lat ≈ 60 NM) so the trig only runs on nearby strikes.
+    # The lon half-width is the circle's widest point; it spans all lons near a pole.
+    cos_lat = math.cos(math.radians(lat))
+    dlat_deg = radius_nm / 60 + 0.1
+    ratio = math.sin(math.radians(dlat_deg)) / max(cos_lat, 1e-9)
+    dlon_deg = math.degrees(math.asin(ratio)) if ratio < 1 else 180.0
+    boxed = np.flatnonzero(
+        (s_ts >= cutoff)
+        & (np.abs(s_lat - lat) < dlat_deg)
+        & (np.abs((s_lon - lon + 180) % 360 - 180) <= dlon_deg)
+    )
 
-    with _strikes_lock:
-        snapshot = list(_strikes)
-
-    nearby = []
-    nearest_nm = None
-    for s_lat, s_lon, s_ts in snapshot:
-        if s_ts < cutoff:
-            continue
-        d = _haversine_nm(lat, lon, s_lat, s_lon)
-        if d <= radius_nm:
-            age_s = int(now - s_ts)
-            nearby.append({"lat": round(s_lat, 4), "lon": round(s_lon, 4), "age_s": age_s})
-            if nearest_nm is None or d < nearest_nm:
-                nearest_nm = round(d, 1)
-
-    nearby.sort(key=lambda x: x["age_s"])
+    dist = _haversine_nm(lat, lon, s_lat[boxed], s_lon[boxed], cos_lat)
+    inside = dist <= radius_nm
+    hits = boxed[inside]
+    nearest_nm = round(float(dist[inside].min()), 1) if hits.size else None
+
+    # Order by age (oldest arrivals first on ties) and only build the dicts we return
+    ages = (now - s_ts[hits]).astype(np.int64)
+    order = np.argsort(ages, kind="stable")[:500]
+    shown = hits[order]
+    strikes = [
+        {"lat": h_lat, "lon": h_lon, "age_s": age}
+        for h_lat, h_lon, age in zip(
+            np.round(s_lat[shown], 4).tolist(),
+            np.round(s_lon[shown], 4).tolist(),
+            ages[order].tolist(),
+            strict=True,
+        )
+    ]
     return jsonify(
         {
-            "strikes": nearby[:500],
-            "count": len(nearby),
+            "strikes": strikes,
+            "count": int(hits.size),
             "nearest_nm": nearest_nm,
             "connected": _blitzortung_connected,
         }